@@ -13,13 +13,16 @@ PAYROLL.PY INTEGRATION:
 ================================================================================
 """
 from contextlib import asynccontextmanager
+
+import anyio.to_thread
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import ORJSONResponse
 
 from config import settings
 from models import init_db, SessionLocal
 from routes import auth_router, hr_router, employee_router
+from routes.files import PayslipStaticFiles
 from services import AuthService
 
 
@@ -31,22 +34,28 @@ async def lifespan(app: FastAPI):
     print("HR Payroll Portal API Starting...")
     print("=" * 60)
     
+    # Blocking handlers are declared as plain def and run in anyio's threadpool
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.THREADPOOL_SIZE
+    
     # Initialize database
     init_db()
     print("✓ Database initialized")
     
-    # Create default HR admin if not exists
-    db = SessionLocal()
-    try:
-        auth_service = AuthService(db)
-        hr_user = auth_service.create_hr_admin(
-            email=settings.DEFAULT_HR_EMAIL,
-            password=settings.DEFAULT_HR_PASSWORD,
-            name=settings.DEFAULT_HR_NAME
-        )
-        print(f"✓ Default HR Admin ready: {settings.DEFAULT_HR_EMAIL}")
-    finally:
-        db.close()
+    # Create default HR admin if not exists (one worker only, so N workers
+    # don't race to hash the same password at startup)
+    if settings.WORKER_ID == 0:
+        db = SessionLocal()
+        try:
+            auth_service = AuthService(db)
+            if not auth_service.user_exists(settings.DEFAULT_HR_EMAIL):
+                auth_service.create_hr_admin(
+                    email=settings.DEFAULT_HR_EMAIL,
+                    password=settings.DEFAULT_HR_PASSWORD,
+                    name=settings.DEFAULT_HR_NAME
+                )
+            print(f"✓ Default HR Admin ready: {settings.DEFAULT_HR_EMAIL}")
+        finally:
+            db.close()
     
     print("=" * 60)
     print(f"API running at http://localhost:8000")
@@ -85,25 +94,29 @@ app = FastAPI(
     The engine is wrapped by PayrollService for database integration.
     """,
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # orjson serialises response payloads several times faster than stdlib json
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware for frontend integration
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=[
-        "http://localhost:5173",  # Vite dev server
-        "http://localhost:3000",  # Alternative dev server
-        "http://127.0.0.1:5173",
-        "http://127.0.0.1:3000",
-    ],
+    # Vite dev server (5173) and alternative dev server (3000) on localhost/127.0.0.1.
+    # Starlette compiles the pattern once; matched with re.fullmatch per request.
+    allow_origin_regex=r"http://(localhost|127\.0\.0\.1):(5173|3000)",
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
 # Static files for payslips
-app.mount("/payslips", StaticFiles(directory=settings.PAYSLIP_DIR), name="payslips")
+# (config already created the directory, so skip StaticFiles' own check)
+app.mount(
+    "/payslips",
+    PayslipStaticFiles(directory=settings.PAYSLIP_DIR, check_dir=False),
+    name="payslips"
+)
 
 # Include routers
 app.include_router(auth_router)
@@ -8,6 +8,8 @@ from auth.jwt_handler import (
     get_current_hr,
     get_current_employee,
     require_hr_or_own_data,
+    invalidate_cached_user,
+    CurrentUser,
 )
 
 __all__ = [
@@ -19,4 +21,6 @@ __all__ = [
     "get_current_hr",
     "get_current_employee",
     "require_hr_or_own_data",
+    "invalidate_cached_user",
+    "CurrentUser",
 ]
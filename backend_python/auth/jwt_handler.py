@@ -1,13 +1,23 @@
 """
 JWT Authentication utilities and middleware
 """
+import base64
+import calendar
+import hashlib
+import hmac
+import json
+import threading
+import time
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Optional
 
+from cachetools import TLRUCache, TTLCache
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from config import settings
@@ -16,24 +26,92 @@ from models.schemas import TokenData
 
 
 # Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# New hashes use bcrypt_sha256 (SHA-256 pre-hash, so no 72-byte limit);
+# existing plain bcrypt hashes still verify.
+pwd_context = CryptContext(
+    schemes=["bcrypt_sha256", "bcrypt"],
+    deprecated="auto",
+    bcrypt_sha256__rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__rounds=settings.BCRYPT_ROUNDS,
+)
 
 # Bearer token security
 security = HTTPBearer()
 
 
+def _b64url(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+# HS256 header and key are constant, so encode them once instead of per token
+_HS256_HEADER_B64 = _b64url(json.dumps({"alg": "HS256", "typ": "JWT"}, separators=(",", ":")).encode())
+_SIGNING_KEY = settings.SECRET_KEY.encode()
+
+# Process-local cache of bcrypt verification results, keyed by a digest of
+# (password, hash). Each gunicorn/uvicorn worker keeps its own copy.
+_pwd_cache = TTLCache(maxsize=2048, ttl=60)
+_pwd_cache_lock = threading.Lock()
+
+# Verified JWT payloads, keyed by a truncated token digest. Entries live for at
+# most 30s and never past the token's own "exp" claim.
+_JWT_CACHE_TTL = 30
+
+
+def _jwt_cache_ttu(_key, value, now):
+    _, exp = value
+    if exp is None:
+        return now + _JWT_CACHE_TTL
+    return min(now + _JWT_CACHE_TTL, exp)
+
+
+_jwt_cache = TLRUCache(maxsize=10_000, ttu=_jwt_cache_ttu, timer=time.time)
+_jwt_cache_lock = threading.Lock()
+
+# Authenticated users by email. Detached snapshots are stored instead of ORM
+# instances so cached entries never outlive or cross database sessions.
+_user_cache = TTLCache(maxsize=5000, ttl=30)
+_user_cache_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class CurrentUser:
+    """Session-independent snapshot of an authenticated user"""
+    id: int
+    email: str
+    name: str
+    role: UserRole
+    emp_id: Optional[str]
+    can_login: bool
+    is_active: bool
+
+
+def invalidate_cached_user(email: Optional[str] = None):
+    """Drop a cached user (or every cached user when no email is given)"""
+    with _user_cache_lock:
+        if email is None:
+            _user_cache.clear()
+        else:
+            _user_cache.pop(email, None)
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
-    # Truncate to 72 bytes for bcrypt limit
-    truncated = plain_password[:72] if len(plain_password) > 72 else plain_password
-    return pwd_context.verify(truncated, hashed_password)
+    # Skip the bcrypt KDF when the same pair was verified recently
+    key = hashlib.sha256((plain_password + "|" + hashed_password).encode()).digest()
+    with _pwd_cache_lock:
+        cached = _pwd_cache.get(key)
+    if cached is not None:
+        return cached
+    
+    result = pwd_context.verify(plain_password, hashed_password)
+    with _pwd_cache_lock:
+        _pwd_cache[key] = result
+    return result
 
 
 def get_password_hash(password: str) -> str:
     """Hash a password"""
-    # Truncate to 72 bytes for bcrypt limit
-    truncated = password[:72] if len(password) > 72 else password
-    return pwd_context.hash(truncated)
+    return pwd_context.hash(password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -44,13 +122,26 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
-    return encoded_jwt
+    if settings.ALGORITHM != "HS256":
+        to_encode.update({"exp": expire})
+        return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    
+    # Sign HS256 tokens directly with the precomputed header and key
+    to_encode.update({"exp": calendar.timegm(expire.utctimetuple())})
+    payload_b64 = _b64url(json.dumps(to_encode, separators=(",", ":")).encode())
+    signing_input = _HS256_HEADER_B64 + b"." + payload_b64
+    signature = hmac.new(_SIGNING_KEY, signing_input, hashlib.sha256).digest()
+    return (signing_input + b"." + _b64url(signature)).decode()
 
 
 def decode_token(token: str) -> TokenData:
     """Decode and validate a JWT token"""
+    token_hash = hashlib.sha256(token.encode()).digest()[:16]
+    with _jwt_cache_lock:
+        cached = _jwt_cache.get(token_hash)
+    if cached is not None:
+        return cached[0]
+    
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         email: str = payload.get("sub")
@@ -62,39 +153,71 @@ def decode_token(token: str) -> TokenData:
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid token: missing email"
             )
-        return TokenData(email=email, role=role, user_id=user_id)
+        # Claims come from a signature-verified token; skip re-validation
+        token_data = TokenData.model_construct(email=email, role=role, user_id=user_id)
     except JWTError as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=f"Invalid token: {str(e)}"
         )
+    
+    # Only successfully verified tokens are cached
+    with _jwt_cache_lock:
+        _jwt_cache[token_hash] = (token_data, payload.get("exp"))
+    return token_data
 
 
-async def get_current_user(
+def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
-) -> User:
-    """Get current authenticated user from JWT token"""
+) -> CurrentUser:
+    """
+    Get current authenticated user from JWT token
+    
+    Declared as a plain function so FastAPI runs the blocking DB query in
+    its threadpool instead of on the event loop.
+    """
     token = credentials.credentials
     token_data = decode_token(token)
     
-    user = db.query(User).filter(User.email == token_data.email).first()
-    if user is None:
+    with _user_cache_lock:
+        cached = _user_cache.get(token_data.email)
+    # A hit must belong to the same account the token was issued for; the
+    # DB path below checks the same thing
+    if cached is not None and token_data.user_id in (None, cached.id):
+        return cached
+    
+    # Plain column rows; no ORM instance is hydrated for the auth check.
+    # Tokens carry user_id, so look up by primary key and confirm the email.
+    query = select(
+        User.id, User.email, User.name, User.role,
+        User.emp_id, User.can_login, User.is_active
+    )
+    if token_data.user_id is not None:
+        query = query.where(User.id == token_data.user_id)
+    else:
+        query = query.where(User.email == token_data.email)
+    row = db.execute(query).first()
+    if row is None or row.email != token_data.email:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found"
         )
     
-    if not user.is_active:
+    if not row.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="User account is disabled"
         )
     
-    return user
+    current_user = CurrentUser(**row._mapping)
+    # Only active users are cached
+    with _user_cache_lock:
+        _user_cache[token_data.email] = current_user
+    return current_user
 
 
-async def get_current_hr(current_user: User = Depends(get_current_user)) -> User:
+async def get_current_hr(current_user: CurrentUser = Depends(get_current_user)) -> CurrentUser:
     """Ensure current user is HR"""
     if current_user.role != UserRole.HR:
         raise HTTPException(
@@ -104,7 +227,7 @@ async def get_current_hr(current_user: User = Depends(get_current_user)) -> User
     return current_user
 
 
-async def get_current_employee(current_user: User = Depends(get_current_user)) -> User:
+async def get_current_employee(current_user: CurrentUser = Depends(get_current_user)) -> CurrentUser:
     """Ensure current user is Employee and can login"""
     if current_user.role != UserRole.EMPLOYEE:
         raise HTTPException(
@@ -121,7 +244,7 @@ async def get_current_employee(current_user: User = Depends(get_current_user)) -
     return current_user
 
 
-def require_hr_or_own_data(current_user: User, target_emp_id: str) -> bool:
+def require_hr_or_own_data(current_user: CurrentUser, target_emp_id: str) -> bool:
     """Check if user can access the data - HR can access all, employees only their own"""
     if current_user.role == UserRole.HR:
         return True
@@ -1,7 +1,7 @@
 """
 Configuration settings for the HR Payroll Backend
 """
-import os
+from pathlib import Path
 from pydantic_settings import BaseSettings
 
 
@@ -11,18 +11,33 @@ class Settings(BaseSettings):
     # Application
     APP_NAME: str = "HR Payroll Portal API"
     DEBUG: bool = True
+    THREADPOOL_SIZE: int = 100  # Worker threads for sync (def) route handlers
     
     # JWT Settings
     SECRET_KEY: str = "hr-payroll-secret-key-change-in-production-2026"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 480  # 8 hours
     
+    # Password hashing cost (bcrypt log2 rounds); each +1 doubles hash time
+    BCRYPT_ROUNDS: int = 10
+    
     # Database
     DATABASE_URL: str = "sqlite:///./hr_payroll.db"
+    POOL_SIZE: int = 10
+    MAX_OVERFLOW: int = 20
+    POOL_TIMEOUT: int = 30
+    POOL_RECYCLE: int = 1800  # seconds
+    
+    # Seconds the active policy / current batch lookups are cached per
+    # process; use 0 when several workers must see changes immediately
+    LOOKUP_CACHE_TTL: int = 30
     
     # Paths
-    UPLOAD_DIR: str = "uploads"
-    PAYSLIP_DIR: str = "payslips"
+    UPLOAD_DIR: Path = Path("uploads")
+    PAYSLIP_DIR: Path = Path("payslips")
+    
+    # Process index when running several workers; only worker 0 bootstraps data
+    WORKER_ID: int = 0
     
     # Default HR Admin (created on first run)
     DEFAULT_HR_EMAIL: str = "admin@company.com"
@@ -37,5 +52,5 @@ class Settings(BaseSettings):
 settings = Settings()
 
 # Ensure directories exist
-os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
-os.makedirs(settings.PAYSLIP_DIR, exist_ok=True)
+settings.UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+settings.PAYSLIP_DIR.mkdir(parents=True, exist_ok=True)
@@ -1,18 +1,51 @@
 """
 Database connection and session management
 """
-from sqlalchemy import create_engine
+from sqlalchemy import (
+    Integer, MetaData, SmallInteger, String, Table, case, cast, column, create_engine,
+    event, insert, inspect, select
+)
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 from config import settings
 
-# Create SQLite engine
+_is_sqlite = settings.DATABASE_URL.startswith("sqlite")
+_is_sqlite_memory = _is_sqlite and (
+    settings.DATABASE_URL in ("sqlite://", "sqlite:///") or ":memory:" in settings.DATABASE_URL
+)
+
+# Pool sizing only applies to QueuePool; in-memory SQLite uses a singleton pool
+_pool_args = {} if _is_sqlite_memory else {
+    "pool_size": settings.POOL_SIZE,
+    "max_overflow": settings.MAX_OVERFLOW,
+    "pool_timeout": settings.POOL_TIMEOUT,
+    "pool_recycle": settings.POOL_RECYCLE,
+}
+
+# Create database engine
 engine = create_engine(
     settings.DATABASE_URL,
-    connect_args={"check_same_thread": False}  # Needed for SQLite
+    pool_pre_ping=True,
+    # Rows per multi-row INSERT when executemany() goes through insertmanyvalues
+    insertmanyvalues_page_size=1000,
+    # Compiled-SQL cache entries (default 500); every distinct statement shape
+    # the services issue stays compiled instead of being re-rendered
+    query_cache_size=1200,
+    connect_args={"check_same_thread": False} if _is_sqlite else {},  # Needed for SQLite
+    **_pool_args
 )
 
+
+if _is_sqlite:
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """Enable WAL so readers don't block behind the writer"""
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+
 # Session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -33,3 +66,97 @@ def init_db():
     """Initialize database tables"""
     from models.entities import User, Employee, PayrollBatch, Payslip, Policy
     Base.metadata.create_all(bind=engine)
+    migrate_enum_columns(engine)
+    
+    # create_all skips existing tables, so indexes added to the models later
+    # (including the unique one payslip regeneration upserts against) are
+    # created here for older databases
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+    
+    # emp_id is already unique on its own, so this earlier composite was
+    # never used; drop it where a previous release created it
+    employees = Table(Employee.__tablename__, MetaData(), autoload_with=engine)
+    for index in employees.indexes:
+        if index.name == "ix_employee_empid_batch":
+            index.drop(bind=engine)
+
+
+def _enum_code_expr(value, enum_type):
+    """SQL mapping a legacy stored enum (member name or value) to its SMALLINT code"""
+    text_value = cast(value, String)
+    codes = {}
+    for member, code in enum_type.codes:
+        codes[member.name] = code
+        codes[member.value] = code
+    # Anything else is already a code, possibly stored as text ('1')
+    return case(codes, value=text_value, else_=cast(text_value, SmallInteger))
+
+
+def _rebuild_sqlite_table(conn, table, legacy_columns, existing_columns):
+    """Recreate a SQLite table with the model's column types, converting enum columns"""
+    legacy_name = f"_legacy_{table.name}"
+    # Model indexes are recreated by init_db; the names must be free first
+    for index in inspect(conn).get_indexes(table.name):
+        conn.exec_driver_sql(f'DROP INDEX "{index["name"]}"')
+    # Keep other tables' foreign keys pointing at table.name, not the renamed copy
+    conn.exec_driver_sql("PRAGMA legacy_alter_table=ON")
+    conn.exec_driver_sql(f'ALTER TABLE "{table.name}" RENAME TO "{legacy_name}"')
+    conn.exec_driver_sql("PRAGMA legacy_alter_table=OFF")
+    
+    table.create(conn)
+    legacy = Table(legacy_name, MetaData(), autoload_with=conn)
+    copied = [col for col in table.columns if col.name in existing_columns]
+    conn.execute(
+        insert(table).from_select(
+            [col.name for col in copied],
+            select(*[
+                _enum_code_expr(legacy.c[col.name], col.type) if col in legacy_columns
+                else legacy.c[col.name]
+                for col in copied
+            ])
+        )
+    )
+    legacy.drop(conn)
+
+
+def migrate_enum_columns(bind):
+    """
+    Convert enum columns from the old schema to SMALLINT codes
+    
+    Databases created before SmallIntEnum keep users.role and
+    payroll_batches.status as VARCHAR member names (a native ENUM on
+    PostgreSQL). Each such column is rebuilt as SMALLINT and its rows are
+    mapped to codes; columns that are already integers are left alone.
+    """
+    from models.entities import SmallIntEnum
+    
+    with bind.begin() as conn:
+        inspector = inspect(conn)
+        existing_tables = set(inspector.get_table_names())
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            db_types = {col["name"]: col["type"] for col in inspector.get_columns(table.name)}
+            legacy_columns = [
+                col for col in table.columns
+                if isinstance(col.type, SmallIntEnum)
+                and col.name in db_types
+                and not isinstance(db_types[col.name], Integer)
+            ]
+            if not legacy_columns:
+                continue
+            
+            if conn.dialect.name == "sqlite":
+                # SQLite can't change a column's type in place
+                _rebuild_sqlite_table(conn, table, legacy_columns, db_types)
+            elif conn.dialect.name == "postgresql":
+                for col in legacy_columns:
+                    using = _enum_code_expr(column(col.name), col.type).compile(
+                        dialect=conn.dialect, compile_kwargs={"literal_binds": True}
+                    )
+                    conn.exec_driver_sql(
+                        f'ALTER TABLE "{table.name}" ALTER COLUMN "{col.name}" '
+                        f'TYPE SMALLINT USING {using}'
+                    )
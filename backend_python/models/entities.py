@@ -1,13 +1,18 @@
 """
 Database entity models for HR Payroll System
 """
-from datetime import datetime
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, Text, Enum as SQLEnum
+from sqlalchemy import Column, Integer, SmallInteger, String, Float, Boolean, DateTime, ForeignKey, Text, Index, func
+from sqlalchemy.types import TypeDecorator
 from sqlalchemy.orm import relationship
 import enum
 
+from config import settings
 from models.database import Base
 
+# Relationships never lazy-load in development so accidental N+1 queries fail
+# loudly; call sites opt in with selectinload()/joinedload()/contains_eager().
+RELATIONSHIP_LAZY = "raise" if settings.DEBUG else "select"
+
 
 class UserRole(enum.Enum):
     HR = "hr"
@@ -21,28 +26,83 @@ class PayrollStatus(enum.Enum):
     REJECTED = "rejected"
 
 
+class SmallIntEnum(TypeDecorator):
+    """
+    Stores an enum as a SMALLINT code instead of a VARCHAR name.
+    
+    Python code keeps using the enum members (and their string values in
+    the API); only the stored representation changes.
+    """
+    impl = SmallInteger
+    cache_ok = True
+    
+    def __init__(self, enum_class, codes):
+        super().__init__()
+        self.enum_class = enum_class
+        self.codes = tuple(codes.items())
+        self._to_code = dict(codes)
+        self._from_code = {code: member for member, code in codes.items()}
+    
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return self._to_code[self.enum_class(value)]
+    
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        if isinstance(value, str):
+            # A column that is still VARCHAR (not yet migrated by init_db)
+            # holds member names, or codes stored as text by TEXT affinity
+            if value.isdigit():
+                return self._from_code[int(value)]
+            return self.enum_class[value]
+        return self._from_code[value]
+
+
+USER_ROLE_CODES = {UserRole.HR: 1, UserRole.EMPLOYEE: 2}
+PAYROLL_STATUS_CODES = {
+    PayrollStatus.DRAFT: 1,
+    PayrollStatus.GENERATED: 2,
+    PayrollStatus.APPROVED: 3,
+    PayrollStatus.REJECTED: 4,
+}
+
+
 class User(Base):
     """User table for both HR and Employees"""
     __tablename__ = "users"
+    __table_args__ = (
+        # Covers the per-request auth lookup (email + is_active check)
+        Index("ix_users_email_active", "email", "is_active"),
+        Index("ix_users_emp_login", "emp_id", "can_login"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    email = Column(String(255), unique=True, index=True, nullable=False)
+    email = Column(String(255), unique=True, nullable=False)
     password_hash = Column(String(255), nullable=False)
     name = Column(String(255), nullable=False)
-    role = Column(SQLEnum(UserRole), nullable=False, default=UserRole.EMPLOYEE)
+    role = Column(SmallIntEnum(UserRole, USER_ROLE_CODES), nullable=False, default=UserRole.EMPLOYEE)
     emp_id = Column(String(50), unique=True, nullable=True)  # Employee ID from Excel
     can_login = Column(Boolean, default=False)  # Employees can login only after approval
     is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Timestamps are filled by the database (CURRENT_TIMESTAMP), not by a Python
+    # callable per row. server_default puts it in the DDL; default renders the
+    # same expression inline in INSERTs so tables created without it work too.
+    created_at = Column(DateTime, default=func.now(), server_default=func.now())
+    updated_at = Column(DateTime, default=func.now(), server_default=func.now(), onupdate=func.now())
     
     # Relationships
-    payslips = relationship("Payslip", back_populates="user")
+    payslips = relationship("Payslip", back_populates="user", lazy=RELATIONSHIP_LAZY)
 
 
 class Employee(Base):
     """Employee details from Excel upload"""
     __tablename__ = "employees"
+    __table_args__ = (
+        # Per-batch employee scans (upload/generate/approve) lead on batch_id
+        Index("ix_employee_batch_emp", "batch_id", "emp_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     emp_id = Column(String(50), unique=True, index=True, nullable=False)
@@ -55,37 +115,49 @@ class Employee(Base):
     other_allowances = Column(Float, default=0)
     gross_salary = Column(Float, default=0)
     batch_id = Column(Integer, ForeignKey("payroll_batches.id"), nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=func.now(), server_default=func.now())
     
     # Relationships
-    batch = relationship("PayrollBatch", back_populates="employees")
-    payslips = relationship("Payslip", back_populates="employee")
+    batch = relationship("PayrollBatch", back_populates="employees", lazy=RELATIONSHIP_LAZY)
+    payslips = relationship("Payslip", back_populates="employee", lazy=RELATIONSHIP_LAZY)
 
 
 class PayrollBatch(Base):
     """Payroll batch for each month's processing"""
     __tablename__ = "payroll_batches"
+    __table_args__ = (
+        # Approved-batch filter in the employee "latest payslip" join
+        Index("ix_batch_status_id", "status", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     month = Column(String(50), nullable=False)  # e.g., "January 2026"
     excel_file_path = Column(String(500), nullable=True)
-    status = Column(SQLEnum(PayrollStatus), default=PayrollStatus.DRAFT)
+    status = Column(SmallIntEnum(PayrollStatus, PAYROLL_STATUS_CODES), default=PayrollStatus.DRAFT)
     total_employees = Column(Integer, default=0)
     total_amount = Column(Float, default=0)
     approved_by = Column(Integer, ForeignKey("users.id"), nullable=True)
     approved_at = Column(DateTime, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, default=func.now(), server_default=func.now())
+    updated_at = Column(DateTime, default=func.now(), server_default=func.now(), onupdate=func.now())
     
     # Relationships
-    employees = relationship("Employee", back_populates="batch")
-    payslips = relationship("Payslip", back_populates="batch")
-    approver = relationship("User", foreign_keys=[approved_by])
+    employees = relationship("Employee", back_populates="batch", lazy=RELATIONSHIP_LAZY)
+    payslips = relationship("Payslip", back_populates="batch", lazy=RELATIONSHIP_LAZY)
+    approver = relationship("User", foreign_keys=[approved_by], lazy=RELATIONSHIP_LAZY)
 
 
 class Payslip(Base):
     """Individual payslip records"""
     __tablename__ = "payslips"
+    __table_args__ = (
+        # One payslip per employee per batch; conflict target for regeneration
+        Index("ix_payslip_emp_batch", "emp_id", "batch_id", unique=True),
+        # Latest payslip per employee: index range scan + LIMIT 1, no sort
+        Index("ix_payslip_emp_created", "emp_id", "created_at"),
+        # A batch's payslips in id order (list, stream, approval linking)
+        Index("ix_payslip_batch_id", "batch_id", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
@@ -124,12 +196,12 @@ class Payslip(Base):
     # PDF
     pdf_path = Column(String(500), nullable=True)
     
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=func.now(), server_default=func.now())
     
     # Relationships
-    user = relationship("User", back_populates="payslips")
-    employee = relationship("Employee", back_populates="payslips")
-    batch = relationship("PayrollBatch", back_populates="payslips")
+    user = relationship("User", back_populates="payslips", lazy=RELATIONSHIP_LAZY)
+    employee = relationship("Employee", back_populates="payslips", lazy=RELATIONSHIP_LAZY)
+    batch = relationship("PayrollBatch", back_populates="payslips", lazy=RELATIONSHIP_LAZY)
 
 
 class Policy(Base):
@@ -146,5 +218,5 @@ class Policy(Base):
     encash_max_days = Column(Integer, default=10)
     policy_text = Column(Text, nullable=True)
     is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, default=func.now(), server_default=func.now())
+    updated_at = Column(DateTime, default=func.now(), server_default=func.now(), onupdate=func.now())
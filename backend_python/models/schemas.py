@@ -3,7 +3,7 @@ Pydantic schemas for request/response validation
 """
 from datetime import datetime
 from typing import Optional, List
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr, TypeAdapter
 
 
 # ============ Auth Schemas ============
@@ -42,8 +42,7 @@ class UserResponse(BaseModel):
     emp_id: Optional[str] = None
     can_login: bool
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, extra="ignore")
 
 
 # ============ Policy Schemas ============
@@ -70,8 +69,7 @@ class PolicyResponse(BaseModel):
     encash_max_days: int
     policy_text: Optional[str] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, extra="ignore")
 
 
 # ============ Employee Schemas ============
@@ -88,8 +86,7 @@ class EmployeeResponse(BaseModel):
     other_allowances: float
     gross_salary: float
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, extra="ignore")
 
 
 class EmployeeListResponse(BaseModel):
@@ -108,8 +105,7 @@ class PayrollBatchResponse(BaseModel):
     approved_at: Optional[datetime] = None
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, extra="ignore")
 
 
 # ============ Payslip Schemas ============
@@ -138,8 +134,7 @@ class PayslipResponse(BaseModel):
     net_pay: float
     pdf_path: Optional[str] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, extra="ignore")
 
 
 class PayslipListResponse(BaseModel):
@@ -173,3 +168,14 @@ class ApprovePayrollResponse(BaseModel):
     success: bool
     message: str
     employees_enabled: int
+
+
+# ============ Precompiled Adapters ============
+# Built once at import and reused on hot paths instead of letting FastAPI
+# re-validate the response model on every request.
+
+PayslipResponseAdapter = TypeAdapter(PayslipResponse)
+UserResponseAdapter = TypeAdapter(UserResponse)
+EmployeeResponseAdapter = TypeAdapter(EmployeeResponse)
+EmployeeListResponseAdapter = TypeAdapter(EmployeeListResponse)
+PayslipListResponseAdapter = TypeAdapter(PayslipListResponse)
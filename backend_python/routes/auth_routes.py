@@ -2,10 +2,11 @@
 Authentication Routes
 """
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import Response
 from sqlalchemy.orm import Session
 
 from models import get_db
-from models.schemas import LoginRequest, Token, MessageResponse, UserResponse
+from models.schemas import LoginRequest, Token, MessageResponse, UserResponse, UserResponseAdapter
 from services import AuthService
 from auth import get_current_user
 from models import User
@@ -14,7 +15,7 @@ router = APIRouter(prefix="/api/auth", tags=["Authentication"])
 
 
 @router.post("/login", response_model=Token)
-async def login(request: LoginRequest, db: Session = Depends(get_db)):
+def login(request: LoginRequest, db: Session = Depends(get_db)):
     """
     Login endpoint for both HR and Employees
     
@@ -22,11 +23,12 @@ async def login(request: LoginRequest, db: Session = Depends(get_db)):
     - Employees can only login after payroll is approved
     """
     auth_service = AuthService(db)
-    token = auth_service.login(request.email, request.password)
+    # One lookup serves both the login attempt and the failure diagnosis
+    user = auth_service.get_user_by_email(request.email)
+    token = auth_service.login_user(user, request.password)
     
     if not token:
         # Check if user exists but can't login
-        user = auth_service.get_user_by_email(request.email)
         if user and not user.can_login:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -49,7 +51,7 @@ async def logout(current_user: User = Depends(get_current_user)):
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(current_user: User = Depends(get_current_user)):
     """Get current authenticated user info"""
-    return UserResponse(
+    user_response = UserResponse(
         id=current_user.id,
         email=current_user.email,
         name=current_user.name,
@@ -57,10 +59,14 @@ async def get_current_user_info(current_user: User = Depends(get_current_user)):
         emp_id=current_user.emp_id,
         can_login=current_user.can_login
     )
+    return Response(
+        content=UserResponseAdapter.dump_json(user_response),
+        media_type="application/json"
+    )
 
 
 @router.post("/change-password", response_model=MessageResponse)
-async def change_password(
+def change_password(
     new_password: str,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -6,22 +6,22 @@ These routes are for Employee operations:
 - Download own payslip PDF
 ================================================================================
 """
-import os
 from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import FileResponse
+from fastapi.responses import Response
 from sqlalchemy.orm import Session
 
 from models import get_db, User, PayrollStatus
-from models.schemas import PayslipResponse, MessageResponse
+from models.schemas import PayslipResponse, PayslipResponseAdapter, MessageResponse
 from services import PayrollService
 from auth import get_current_employee, get_current_user, require_hr_or_own_data
+from routes.files import payslip_file_response
 from models import UserRole
 
 router = APIRouter(prefix="/api/employee", tags=["Employee Portal"])
 
 
 @router.get("/payslip", response_model=PayslipResponse)
-async def get_my_payslip(
+def get_my_payslip(
     current_user: User = Depends(get_current_employee),
     db: Session = Depends(get_db)
 ):
@@ -46,11 +46,16 @@ async def get_my_payslip(
             detail="No approved payslip found"
         )
     
-    return PayslipResponse.model_validate(payslip)
+    # Validate once and serialize directly, skipping FastAPI's second pass
+    payslip_response = PayslipResponseAdapter.validate_python(payslip, from_attributes=True)
+    return Response(
+        content=PayslipResponseAdapter.dump_json(payslip_response),
+        media_type="application/json"
+    )
 
 
 @router.get("/payslip/download")
-async def download_my_payslip(
+def download_my_payslip(
     current_user: User = Depends(get_current_employee),
     db: Session = Depends(get_db)
 ):
@@ -75,22 +80,11 @@ async def download_my_payslip(
             detail="Payslip PDF not found"
         )
     
-    pdf_path = payslip.pdf_path
-    if not os.path.exists(pdf_path):
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="PDF file not found on server"
-        )
-    
-    return FileResponse(
-        path=pdf_path,
-        filename=os.path.basename(pdf_path),
-        media_type="application/pdf"
-    )
+    return payslip_file_response(payslip.pdf_path)
 
 
 @router.get("/profile")
-async def get_my_profile(
+def get_my_profile(
     current_user: User = Depends(get_current_employee),
     db: Session = Depends(get_db)
 ):
@@ -107,7 +101,7 @@ async def get_my_profile(
 # ============ Shared Route (HR or Employee) ============
 
 @router.get("/payslip/{emp_id}", response_model=PayslipResponse)
-async def get_payslip_with_auth(
+def get_payslip_with_auth(
     emp_id: str,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -137,4 +131,9 @@ async def get_payslip_with_auth(
             detail="Payslip not found"
         )
     
-    return PayslipResponse.model_validate(payslip)
+    # Validate once and serialize directly, skipping FastAPI's second pass
+    payslip_response = PayslipResponseAdapter.validate_python(payslip, from_attributes=True)
+    return Response(
+        content=PayslipResponseAdapter.dump_json(payslip_response),
+        media_type="application/json"
+    )
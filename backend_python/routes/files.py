@@ -0,0 +1,75 @@
+"""
+Payslip file serving helpers
+"""
+import os
+from functools import lru_cache
+
+from fastapi import HTTPException, status
+from fastapi.staticfiles import StaticFiles
+from starlette.responses import FileResponse, Response
+from starlette.types import Scope
+
+# Regenerating a payslip rewrites the same filename, so responses are not
+# marked immutable; the ETag/Last-Modified headers allow cheap revalidation.
+PAYSLIP_CACHE_CONTROL = "private, max-age=3600"
+
+# PDFs up to this size are served from memory instead of re-read from disk
+SMALL_FILE_BYTES = 200 * 1024
+
+
+@lru_cache(maxsize=128)
+def _read_file_bytes(path: str, mtime_ns: int, size: int) -> bytes:
+    """Read a file once per (path, mtime, size) version"""
+    with open(path, "rb") as f:
+        return f.read()
+
+
+class PayslipStaticFiles(StaticFiles):
+    """StaticFiles mount that adds cache headers and keeps small PDFs in memory"""
+
+    def file_response(
+        self,
+        full_path,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        response.headers["Cache-Control"] = PAYSLIP_CACHE_CONTROL
+
+        if (
+            isinstance(response, FileResponse)
+            and scope["method"] == "GET"
+            and stat_result.st_size <= SMALL_FILE_BYTES
+        ):
+            content = _read_file_bytes(
+                os.fspath(full_path), stat_result.st_mtime_ns, stat_result.st_size
+            )
+            return Response(content, status_code=status_code, headers=dict(response.headers))
+
+        return response
+
+
+def payslip_file_response(pdf_path: str) -> FileResponse:
+    """
+    Build the download response for a payslip PDF
+
+    The file is stat'ed here (doubling as the existence check) and the result
+    handed to FileResponse, so Content-Length/ETag/Last-Modified are set up
+    front and Starlette skips its own threadpool stat when sending.
+    """
+    try:
+        stat_result = os.stat(pdf_path)
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="PDF file not found on server"
+        )
+
+    return FileResponse(
+        path=pdf_path,
+        filename=os.path.basename(pdf_path),
+        media_type="application/pdf",
+        stat_result=stat_result,
+        headers={"Cache-Control": PAYSLIP_CACHE_CONTROL}
+    )
@@ -11,28 +11,37 @@ These routes are for HR Admin operations:
 ================================================================================
 """
 import os
-import shutil
+import tempfile
 from datetime import datetime
 from typing import Optional
 
+import aiofiles
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
-from fastapi.responses import FileResponse
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from config import settings
-from models import get_db, User, PayrollStatus
+from models import get_db, SessionLocal, User, PayrollStatus
 from models.schemas import (
     PolicyRequest, PolicyResponse, MessageResponse,
     UploadResponse, GeneratePayrollResponse, ApprovePayrollResponse,
-    EmployeeListResponse, EmployeeResponse,
-    PayslipListResponse, PayslipResponse,
+    EmployeeListResponse, EmployeeListResponseAdapter, EmployeeResponseAdapter,
+    PayslipListResponse, PayslipResponse, PayslipListResponseAdapter, PayslipResponseAdapter,
     PayrollBatchResponse
 )
 from services import PayrollService
 from auth import get_current_hr
+from routes.files import payslip_file_response
 
 router = APIRouter(prefix="/api", tags=["HR Payroll"])
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Read size when copying an upload to disk; 1 MiB keeps the number of
+# read/write calls low compared to copyfileobj's small default buffer
+UPLOAD_CHUNK_SIZE = 1 << 20
+
 
 # ============ Excel Upload ============
 
@@ -64,40 +73,56 @@ async def upload_excel(
     filename = f"upload_{timestamp}_{file.filename}"
     file_path = os.path.join(settings.UPLOAD_DIR, filename)
     
+    # Stream into a temp file next to the final path; it is only moved into
+    # place once it parses, so failed or interrupted uploads leave nothing behind
+    fd, tmp_path = tempfile.mkstemp(
+        dir=settings.UPLOAD_DIR, prefix=".upload_", suffix=os.path.splitext(file.filename)[1]
+    )
     try:
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to save file: {str(e)}"
-        )
-    
-    # Process with PayrollService
-    # >>> PAYROLL.PY IS CALLED HERE via PayrollService <<<
-    try:
-        payroll_service = PayrollService(db)
-        result = payroll_service.upload_excel(file_path, month)
+        # Copy chunk by chunk with async reads/writes so the event loop keeps
+        # serving other requests while the upload is written out
+        try:
+            async with aiofiles.open(fd, "wb") as buffer:
+                while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                    await buffer.write(chunk)
+                await buffer.flush()
+                await run_in_threadpool(os.fsync, buffer.fileno())
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to save file: {str(e)}"
+            )
         
-        return UploadResponse(
-            success=True,
-            message=f"Successfully uploaded and processed {result['employees_count']} employees",
-            employees_count=result['employees_count'],
-            batch_id=result['batch_id']
-        )
-    except ValueError as e:
-        # Clean up file on error
-        os.remove(file_path)
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=str(e)
-        )
+        # Process with PayrollService
+        # >>> PAYROLL.PY IS CALLED HERE via PayrollService <<<
+        # (Excel parsing and DB inserts are blocking, so run them off the event loop)
+        try:
+            payroll_service = PayrollService(db)
+            result = await run_in_threadpool(
+                payroll_service.upload_excel, tmp_path, month, final_path=file_path
+            )
+            
+            return UploadResponse(
+                success=True,
+                message=f"Successfully uploaded and processed {result['employees_count']} employees",
+                employees_count=result['employees_count'],
+                batch_id=result['batch_id']
+            )
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+    finally:
+        # Clean up file on error (after success it has been renamed away)
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
 
 
 # ============ Policy Settings ============
 
 @router.post("/set-policy", response_model=PolicyResponse)
-async def set_policy(
+def set_policy(
     policy: PolicyRequest,
     current_user: User = Depends(get_current_hr),
     db: Session = Depends(get_db)
@@ -118,7 +143,7 @@ async def set_policy(
 
 
 @router.get("/policy", response_model=PolicyResponse)
-async def get_policy(
+def get_policy(
     current_user: User = Depends(get_current_hr),
     db: Session = Depends(get_db)
 ):
@@ -138,7 +163,7 @@ async def get_policy(
 # ============ Generate Payroll ============
 
 @router.post("/generate-all", response_model=GeneratePayrollResponse)
-async def generate_all_payroll(
+def generate_all_payroll(
     batch_id: Optional[int] = None,
     current_user: User = Depends(get_current_hr),
     db: Session = Depends(get_db)
@@ -184,7 +209,7 @@ async def generate_all_payroll(
 # ============ Approve Payroll ============
 
 @router.post("/approve-payroll", response_model=ApprovePayrollResponse)
-async def approve_payroll(
+def approve_payroll(
     batch_id: Optional[int] = None,
     current_user: User = Depends(get_current_hr),
     db: Session = Depends(get_db)
@@ -225,11 +250,29 @@ async def approve_payroll(
         )
 
 
+# ============ Streaming ============
+
+def _stream_ndjson(iter_rows, adapter):
+    """
+    Yield one JSON document per row
+    
+    Runs after the request's own session has been closed, so the rows are
+    read through a dedicated session that lives as long as the stream.
+    """
+    db = SessionLocal()
+    try:
+        for row in iter_rows(PayrollService(db)):
+            yield adapter.dump_json(adapter.validate_python(row, from_attributes=True)) + b"\n"
+    finally:
+        db.close()
+
+
 # ============ Employees ============
 
 @router.get("/employees", response_model=EmployeeListResponse)
-async def list_employees(
+def list_employees(
     batch_id: Optional[int] = None,
+    stream: bool = False,
     current_user: User = Depends(get_current_hr),
     db: Session = Depends(get_db)
 ):
@@ -238,21 +281,34 @@ async def list_employees(
     
     - Only HR can access this endpoint
     - Optionally filter by batch
+    - stream=true returns NDJSON, one employee per line
     """
+    if stream:
+        return StreamingResponse(
+            _stream_ndjson(lambda service: service.iter_employees(batch_id), EmployeeResponseAdapter),
+            media_type=NDJSON_MEDIA_TYPE
+        )
+    
     payroll_service = PayrollService(db)
     employees = payroll_service.get_employees(batch_id)
     
-    return EmployeeListResponse(
-        employees=[EmployeeResponse.model_validate(e) for e in employees],
-        total=len(employees)
+    # One validation pass straight from the ORM rows, serialised without
+    # FastAPI re-validating the response model
+    employee_list = EmployeeListResponseAdapter.validate_python(
+        {"employees": employees, "total": len(employees)}, from_attributes=True
+    )
+    return Response(
+        content=EmployeeListResponseAdapter.dump_json(employee_list),
+        media_type="application/json"
     )
 
 
 # ============ Payslips (HR View) ============
 
 @router.get("/payslips", response_model=PayslipListResponse)
-async def list_payslips(
+def list_payslips(
     batch_id: Optional[int] = None,
+    stream: bool = False,
     current_user: User = Depends(get_current_hr),
     db: Session = Depends(get_db)
 ):
@@ -261,25 +317,36 @@ async def list_payslips(
     
     - Only HR can access this endpoint
     - Optionally filter by batch
+    - stream=true returns NDJSON, one payslip per line
     """
     payroll_service = PayrollService(db)
     
-    if not batch_id:
-        batch = payroll_service.get_current_batch()
-        batch_id = batch.id if batch else None
+    if stream:
+        if not batch_id:
+            batch_id = payroll_service.get_current_batch_id()
+        return StreamingResponse(
+            _stream_ndjson(lambda service: service.iter_payslips(batch_id), PayslipResponseAdapter),
+            media_type=NDJSON_MEDIA_TYPE
+        )
     
-    payslips = payroll_service.get_payslips(batch_id)
-    batch = payroll_service.get_batch_by_id(batch_id) if batch_id else None
+    payslips, batch_status = payroll_service.get_payslips_with_status(batch_id)
     
-    return PayslipListResponse(
-        payslips=[PayslipResponse.model_validate(p) for p in payslips],
-        total=len(payslips),
-        batch_status=batch.status.value if batch else "unknown"
+    payslip_list = PayslipListResponseAdapter.validate_python(
+        {
+            "payslips": payslips,
+            "total": len(payslips),
+            "batch_status": batch_status
+        },
+        from_attributes=True
+    )
+    return Response(
+        content=PayslipListResponseAdapter.dump_json(payslip_list),
+        media_type="application/json"
     )
 
 
 @router.get("/payslip/{emp_id}", response_model=PayslipResponse)
-async def get_payslip_by_emp_id(
+def get_payslip_by_emp_id(
     emp_id: str,
     current_user: User = Depends(get_current_hr),
     db: Session = Depends(get_db)
@@ -303,7 +370,7 @@ async def get_payslip_by_emp_id(
 
 
 @router.get("/payslip/{emp_id}/download")
-async def download_payslip(
+def download_payslip(
     emp_id: str,
     current_user: User = Depends(get_current_hr),
     db: Session = Depends(get_db)
@@ -322,24 +389,13 @@ async def download_payslip(
             detail="Payslip PDF not found"
         )
     
-    pdf_path = payslips[-1].pdf_path
-    if not os.path.exists(pdf_path):
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="PDF file not found on server"
-        )
-    
-    return FileResponse(
-        path=pdf_path,
-        filename=os.path.basename(pdf_path),
-        media_type="application/pdf"
-    )
+    return payslip_file_response(payslips[-1].pdf_path)
 
 
 # ============ Batch Status ============
 
 @router.get("/batch", response_model=PayrollBatchResponse)
-async def get_current_batch(
+def get_current_batch(
     current_user: User = Depends(get_current_hr),
     db: Session = Depends(get_db)
 ):
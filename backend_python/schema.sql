@@ -10,7 +10,7 @@ CREATE TABLE IF NOT EXISTS users (
     email VARCHAR(255) UNIQUE NOT NULL,
     password_hash VARCHAR(255) NOT NULL,
     name VARCHAR(255) NOT NULL,
-    role VARCHAR(20) NOT NULL CHECK (role IN ('hr', 'employee')),
+    role SMALLINT NOT NULL,  -- 1 = hr, 2 = employee
     emp_id VARCHAR(50) UNIQUE,  -- Employee ID from Excel (NULL for HR)
     can_login BOOLEAN DEFAULT FALSE,  -- Employees can login only after approval
     is_active BOOLEAN DEFAULT TRUE,
@@ -41,7 +41,7 @@ CREATE TABLE IF NOT EXISTS payroll_batches (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     month VARCHAR(50) NOT NULL,  -- e.g., "January 2026"
     excel_file_path VARCHAR(500),
-    status VARCHAR(20) NOT NULL CHECK (status IN ('draft', 'generated', 'approved', 'rejected')) DEFAULT 'draft',
+    status SMALLINT NOT NULL DEFAULT 1,  -- 1 = draft, 2 = generated, 3 = approved, 4 = rejected
     total_employees INTEGER DEFAULT 0,
     total_amount FLOAT DEFAULT 0,
     approved_by INTEGER REFERENCES users(id),
@@ -112,9 +112,13 @@ CREATE TABLE IF NOT EXISTS policies (
 );
 
 -- ============ Indexes ============
-CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
-CREATE INDEX IF NOT EXISTS idx_users_emp_id ON users(emp_id);
-CREATE INDEX IF NOT EXISTS idx_employees_emp_id ON employees(emp_id);
+CREATE INDEX IF NOT EXISTS ix_users_email_active ON users(email, is_active);
+CREATE INDEX IF NOT EXISTS ix_users_emp_login ON users(emp_id, can_login);
+CREATE UNIQUE INDEX IF NOT EXISTS ix_payslip_emp_batch ON payslips(emp_id, batch_id);
+CREATE INDEX IF NOT EXISTS ix_payslip_emp_created ON payslips(emp_id, created_at);
+CREATE INDEX IF NOT EXISTS ix_batch_status_id ON payroll_batches(status, id);
+CREATE INDEX IF NOT EXISTS ix_employee_batch_emp ON employees(batch_id, emp_id);
+CREATE INDEX IF NOT EXISTS ix_payslip_batch_id ON payslips(batch_id, id);
 CREATE INDEX IF NOT EXISTS idx_employees_batch_id ON employees(batch_id);
 CREATE INDEX IF NOT EXISTS idx_payslips_emp_id ON payslips(emp_id);
 CREATE INDEX IF NOT EXISTS idx_payslips_batch_id ON payslips(batch_id);
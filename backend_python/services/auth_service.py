@@ -3,11 +3,12 @@ Authentication Service
 """
 from datetime import timedelta
 from typing import Optional
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from config import settings
 from models import User, UserRole
-from auth import verify_password, get_password_hash, create_access_token
+from auth import verify_password, get_password_hash, create_access_token, invalidate_cached_user
 from models.schemas import Token
 
 
@@ -28,8 +29,11 @@ class AuthService:
     
     def login(self, email: str, password: str) -> Optional[Token]:
         """Login and return JWT token"""
-        user = self.authenticate_user(email, password)
-        if not user:
+        return self.login_user(self.get_user_by_email(email), password)
+    
+    def login_user(self, user: Optional[User], password: str) -> Optional[Token]:
+        """Login an already looked-up user (lets callers reuse the row)"""
+        if not user or not verify_password(password, user.password_hash):
             return None
         
         # Check if user is active
@@ -76,6 +80,12 @@ class AuthService:
         self.db.refresh(user)
         return user
     
+    def user_exists(self, email: str) -> bool:
+        """Cheap existence check (no row hydration, no password work)"""
+        return self.db.execute(
+            select(1).where(User.email == email).limit(1)
+        ).first() is not None
+    
     def get_user_by_email(self, email: str) -> Optional[User]:
         """Get user by email"""
         return self.db.query(User).filter(User.email == email).first()
@@ -86,10 +96,11 @@ class AuthService:
     
     def change_password(self, user_id: int, new_password: str) -> bool:
         """Change user password"""
-        user = self.db.query(User).filter(User.id == user_id).first()
+        user = self.db.get(User, user_id)
         if not user:
             return False
         
         user.password_hash = get_password_hash(new_password)
         self.db.commit()
+        invalidate_cached_user(user.email)
         return True
@@ -7,20 +7,121 @@ integration for the HR Portal APIs.
 PAYROLL.PY INTEGRATION POINTS ARE MARKED WITH: >>> PAYROLL.PY CALL <<<
 ================================================================================
 """
+import hashlib
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Optional, Dict, Any
-from sqlalchemy.orm import Session
+from functools import lru_cache
+from typing import Iterator, List, Optional, Dict, Any, Tuple
+import orjson
+import pandas as pd
+from cachetools import TTLCache
+from sqlalchemy import Row, delete, insert, inspect, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, load_only
 
 from config import settings
 from models import (
     User, UserRole, Employee, PayrollBatch, PayrollStatus, Payslip, Policy
 )
-from auth import get_password_hash
+from auth import get_password_hash, invalidate_cached_user
 
 # >>> PAYROLL.PY IMPORT <<<
 from services.payroll_agent import PayrollAgent
 
+# Active policy / current batch id, keyed by kind. These change at human pace
+# but are read on most HR requests. ORM entries are detached from their
+# session, and a cached None (no policy / no batch yet) is a valid hit.
+_lookup_cache = TTLCache(maxsize=8, ttl=settings.LOOKUP_CACHE_TTL)
+_lookup_cache_lock = threading.Lock()
+_MISSING = object()
+
+# Columns the list/detail endpoints actually return; the rest (foreign keys,
+# timestamps) stay unloaded and are fetched on first access if ever needed
+_EMPLOYEE_API_COLUMNS = load_only(
+    Employee.id, Employee.emp_id, Employee.name, Employee.designation,
+    Employee.department, Employee.email, Employee.basic_da, Employee.hra,
+    Employee.other_allowances, Employee.gross_salary
+)
+_PAYSLIP_API_COLUMNS = load_only(
+    Payslip.id, Payslip.emp_id, Payslip.name, Payslip.designation, Payslip.month,
+    Payslip.present_days, Payslip.approved_paid_leaves, Payslip.lop_days,
+    Payslip.payable_days, Payslip.remaining_leaves, Payslip.basic_da, Payslip.hra,
+    Payslip.other_allowances, Payslip.gross, Payslip.encashment, Payslip.pf,
+    Payslip.esi, Payslip.pt, Payslip.tds, Payslip.total_deductions,
+    Payslip.net_pay, Payslip.pdf_path
+)
+
+# Employees per payroll chunk: computed, rendered and written to the DB together
+PAYSLIP_CHUNK_SIZE = 1000
+
+# Dialects with INSERT ... ON CONFLICT DO UPDATE
+_UPSERT_INSERTS = {"postgresql": pg_insert, "sqlite": sqlite_insert}
+
+
+def _policy_digest(values: Dict[str, Any]) -> bytes:
+    """Content hash of policy settings; numbers compare by value (1800 == 1800.0)"""
+    normalized = {
+        key: float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else value
+        for key, value in values.items()
+    }
+    return hashlib.blake2b(orjson.dumps(normalized, option=orjson.OPT_SORT_KEYS), digest_size=16).digest()
+
+
+def _hash_passwords(passwords: List[str]) -> List[str]:
+    """
+    Hash passwords in input order, spread over the available cores
+    
+    bcrypt releases the GIL while hashing, so threads run the rounds in
+    parallel without the startup and pickling cost of a process pool.
+    """
+    workers = min(len(passwords), os.cpu_count() or 1)
+    if workers <= 1:
+        return [get_password_hash(password) for password in passwords]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(get_password_hash, passwords))
+
+
+@lru_cache(maxsize=16)
+def _month_label(year: int, month: int) -> str:
+    """Batch display month, e.g. "January 2026"; formatted once per month"""
+    return datetime(year, month, 1).strftime("%B %Y")
+
+
+def _payslip_values(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Payslip column values for one agent payroll result"""
+    return {
+        'emp_id': result['emp_id'],
+        'name': result['name'],
+        'designation': result['designation'],
+        'month': result['month'],
+        'present_days': result['present_days'],
+        'approved_paid_leaves': result['approved_paid_leaves'],
+        'lop_days': result['lop_days'],
+        'payable_days': result['payable_days'],
+        'remaining_leaves': result['remaining_leaves'],
+        'basic_da': result['basic_da'],
+        'hra': result['hra'],
+        'other_allowances': result['other_allow'],
+        'gross': result['gross'],
+        'encashment': result['encashment'],
+        'pf': result['pf'],
+        'esi': result['esi'],
+        'pt': result['pt'],
+        'tds': result['tds'],
+        'total_deductions': result['total_deductions'],
+        'net_pay': result['net_pay'],
+        'pdf_path': result.get('pdf_path')
+    }
+
+
+def invalidate_lookup_cache(kind: str):
+    """Drop one cached lookup ("policy" or "current_batch_id")"""
+    with _lookup_cache_lock:
+        _lookup_cache.pop(kind, None)
+
 
 class PayrollService:
     """
@@ -31,18 +132,43 @@ class PayrollService:
         self.db = db
         # >>> PAYROLL.PY INSTANTIATION <<<
         self.agent = PayrollAgent(payslip_output_dir=settings.PAYSLIP_DIR)
+        self._dialect = db.get_bind().dialect.name
+    
+    def _cached_lookup(self, kind: str, load):
+        """Read-through cache for small, rarely changing lookups"""
+        with _lookup_cache_lock:
+            cached = _lookup_cache.get(kind, _MISSING)
+        if cached is not _MISSING:
+            return cached
+        
+        return self._store_lookup(kind, load())
+    
+    def _store_lookup(self, kind: str, obj):
+        """Put a freshly loaded (or just written) object into the lookup cache"""
+        if inspect(obj, raiseerr=False) is not None and obj in self.db:
+            # Detach with its loaded state so other sessions can read it
+            self.db.expunge(obj)
+        with _lookup_cache_lock:
+            _lookup_cache[kind] = obj
+        return obj
     
     def get_active_policy(self) -> Optional[Policy]:
-        """Get the current active policy from database"""
-        return self.db.query(Policy).filter(Policy.is_active == True).first()
+        """
+        Get the current active policy from database
+        
+        Saves on this worker write through to the cache. Another worker's
+        save is only seen once the entry expires, so deployments running
+        several workers should set LOOKUP_CACHE_TTL=0.
+        """
+        return self._cached_lookup("policy", self._load_active_policy)
+    
+    def _load_active_policy(self) -> Optional[Policy]:
+        """Read the active policy row (newest first if a race left two active)"""
+        return self.db.query(Policy).filter(Policy.is_active == True).order_by(Policy.id.desc()).first()
     
     def create_or_update_policy(self, policy_data: dict) -> Policy:
         """Create or update policy settings"""
-        # Deactivate existing policies
-        self.db.query(Policy).update({Policy.is_active: False})
-        
-        # Create new policy
-        policy = Policy(
+        values = dict(
             pf_rate=policy_data.get('pf_rate', 0.12),
             pf_cap=policy_data.get('pf_cap', 1800),
             esi_employee_rate=policy_data.get('esi_employee_rate', 0.0075),
@@ -51,11 +177,29 @@ class PayrollService:
             leave_encashment=policy_data.get('leave_encashment', False),
             encash_max_days=policy_data.get('encash_max_days', 10),
             policy_text=policy_data.get('policy_text'),
-            is_active=True
         )
-        self.db.add(policy)
+        
+        # Saving the same settings again is a no-op: keep the active row
+        active = self.get_active_policy()
+        if active is not None and _policy_digest(values) == _policy_digest(
+            {field: getattr(active, field) for field in values}
+        ):
+            self._apply_policy_to_agent(active)
+            return active
+        
+        # Deactivate existing policies
+        self.db.query(Policy).update({Policy.is_active: False})
+        
+        # Create new policy; RETURNING loads every column (server defaults
+        # included), so no refresh SELECT is needed after the commit
+        policy = self.db.execute(
+            insert(Policy).values(**values, is_active=True).returning(Policy)
+        ).scalar_one()
+        # Detach before commit so the loaded state isn't expired by it
+        self.db.expunge(policy)
         self.db.commit()
-        self.db.refresh(policy)
+        # Write-through: the next read of the active policy is served from memory
+        self._store_lookup("policy", policy)
         
         # >>> PAYROLL.PY CALL - Apply policy to agent <<<
         self._apply_policy_to_agent(policy)
@@ -80,53 +224,60 @@ class PayrollService:
             # >>> PAYROLL.PY CALL <<<
             self.agent.update_policy(policy.policy_text)
     
-    def upload_excel(self, file_path: str, month: Optional[str] = None) -> Dict[str, Any]:
+    def upload_excel(
+        self, file_path: str, month: Optional[str] = None, final_path: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Process uploaded Excel file and create payroll batch
+        
+        When final_path is given, file_path is a staging file that is renamed
+        to final_path once it has loaded successfully.
         """
         if month is None:
-            month = datetime.now().strftime("%B %Y")
+            now = datetime.now()
+            month = _month_label(now.year, now.month)
         
         # >>> PAYROLL.PY CALL - Load Excel into agent <<<
         success = self.agent.load_uploaded_excel(file_path)
         if not success:
             raise ValueError("Failed to load Excel file. Check format.")
         
-        # Create payroll batch
-        batch = PayrollBatch(
-            month=month,
-            excel_file_path=file_path,
-            status=PayrollStatus.DRAFT
-        )
-        self.db.add(batch)
-        self.db.commit()
-        self.db.refresh(batch)
-        
-        # >>> PAYROLL.PY CALL - Get employee list from loaded data <<<
-        employees_data = self.agent.get_employee_list()
-        
-        # Store employees in database
-        for emp_data in employees_data:
-            employee = Employee(
-                emp_id=emp_data['emp_id'],
-                name=emp_data['name'],
-                designation=emp_data['designation'],
-                department=emp_data['department'],
-                email=emp_data['email'],
-                basic_da=emp_data['basic_da'],
-                hra=emp_data['hra'],
-                other_allowances=emp_data['other_allowances'],
-                gross_salary=emp_data['gross_salary'],
-                batch_id=batch.id
+        if final_path is not None:
+            # Atomic within the upload directory; the batch only ever
+            # references a complete, parseable file
+            os.replace(file_path, final_path)
+            file_path = final_path
+        
+        # >>> PAYROLL.PY CALL - Get employee columns from loaded data <<<
+        employees_df = self.agent.get_employee_dataframe()
+        employees_count = len(employees_df)
+        
+        # Create payroll batch; the new id comes back on the INSERT itself
+        # (RETURNING), and the batch and its employees commit together below
+        batch_id = self.db.execute(
+            insert(PayrollBatch.__table__)
+            .values(
+                month=month,
+                excel_file_path=file_path,
+                status=PayrollStatus.DRAFT,
+                total_employees=employees_count
             )
-            self.db.add(employee)
+            .returning(PayrollBatch.id)
+        ).scalar_one()
+        
+        # Store employees in database: one executemany INSERT, no ORM objects.
+        # batch_id is added as a column and the records are built by pandas.
+        if employees_count:
+            employees_df['batch_id'] = batch_id
+            self._bulk_insert(Employee, employees_df.to_dict(orient='records'))
         
-        batch.total_employees = len(employees_data)
         self.db.commit()
+        # A new batch is now the current one
+        invalidate_lookup_cache("current_batch_id")
         
         return {
-            "batch_id": batch.id,
-            "employees_count": len(employees_data),
+            "batch_id": batch_id,
+            "employees_count": employees_count,
             "month": month
         }
     
@@ -134,7 +285,7 @@ class PayrollService:
         """
         Generate payroll for all employees in a batch
         """
-        batch = self.db.query(PayrollBatch).filter(PayrollBatch.id == batch_id).first()
+        batch = self.db.get(PayrollBatch, batch_id)
         if not batch:
             raise ValueError("Batch not found")
         
@@ -151,67 +302,90 @@ class PayrollService:
             # >>> PAYROLL.PY CALL - Reload Excel <<<
             self.agent.load_uploaded_excel(batch.excel_file_path)
         
-        # >>> PAYROLL.PY CALL - Generate all payslips <<<
-        payroll_results = self.agent.generate_all_payslips()
-        
-        # Clear existing payslips for this batch
-        self.db.query(Payslip).filter(Payslip.batch_id == batch_id).delete()
+        # Employee ids for the batch in one query instead of one per payslip
+        emp_map = dict(self.db.execute(
+            select(Employee.emp_id, Employee.id).where(Employee.batch_id == batch_id)
+        ).all())
         
+        # >>> PAYROLL.PY CALL - Generate all payslips <<<
+        # Results arrive in chunks and each chunk is written before the next
+        # is computed, so memory stays bounded by the chunk size
+        payslips_generated = 0
         total_amount = 0
-        
-        # Store payslips in database
-        for result in payroll_results:
-            employee = self.db.query(Employee).filter(
-                Employee.emp_id == result['emp_id'],
-                Employee.batch_id == batch_id
-            ).first()
-            
-            if not employee:
-                continue
-            
-            payslip = Payslip(
-                employee_id=employee.id,
-                batch_id=batch_id,
-                emp_id=result['emp_id'],
-                name=result['name'],
-                designation=result['designation'],
-                month=result['month'],
-                present_days=result['present_days'],
-                approved_paid_leaves=result['approved_paid_leaves'],
-                lop_days=result['lop_days'],
-                payable_days=result['payable_days'],
-                remaining_leaves=result['remaining_leaves'],
-                basic_da=result['basic_da'],
-                hra=result['hra'],
-                other_allowances=result['other_allow'],
-                gross=result['gross'],
-                encashment=result['encashment'],
-                pf=result['pf'],
-                esi=result['esi'],
-                pt=result['pt'],
-                tds=result['tds'],
-                total_deductions=result['total_deductions'],
-                net_pay=result['net_pay'],
-                pdf_path=result.get('pdf_path')
-            )
-            self.db.add(payslip)
-            total_amount += result['net_pay']
+        for payroll_results in self.agent.iter_payslip_chunks(PAYSLIP_CHUNK_SIZE):
+            payslips_generated += len(payroll_results)
+            # Store payslips in database (results without an employee are skipped)
+            payslip_rows = [
+                {
+                    'employee_id': emp_map[result['emp_id']],
+                    'batch_id': batch_id,
+                    **_payslip_values(result)
+                }
+                for result in payroll_results
+                if result['emp_id'] in emp_map
+            ]
+            self._upsert_payslips(payslip_rows)
+            total_amount += sum(row['net_pay'] for row in payslip_rows)
         
         batch.status = PayrollStatus.GENERATED
         batch.total_amount = total_amount
         self.db.commit()
         
         return {
-            "payslips_generated": len(payroll_results),
+            "payslips_generated": payslips_generated,
             "total_amount": total_amount,
             "batch_id": batch_id
         }
     
+    def _bulk_insert(self, model, rows: List[Dict[str, Any]]):
+        """
+        Insert many rows with one Core executemany (no ORM unit of work)
+        
+        Against the Core table, SQLAlchemy batches the rows per dialect:
+        multi-row VALUES pages (insertmanyvalues) on PostgreSQL and the
+        driver's native executemany on SQLite.
+        """
+        if rows:
+            self.db.execute(insert(model.__table__), rows)
+    
+    def _upsert_payslips(self, rows: List[Dict[str, Any]]):
+        """
+        Write payslips, replacing any earlier generation's for the same employees
+        
+        Uses INSERT ... ON CONFLICT (emp_id, batch_id) DO UPDATE where the
+        dialect supports it, so regenerated payslips keep their ids. Other
+        dialects delete the matching (emp_id, batch_id) rows and re-insert.
+        Either way it can be called once per chunk of a batch.
+        """
+        if not rows:
+            return
+        dialect_insert = _UPSERT_INSERTS.get(self._dialect)
+        if dialect_insert is None:
+            self.db.execute(
+                delete(Payslip.__table__).where(
+                    tuple_(Payslip.emp_id, Payslip.batch_id).in_(
+                        [(row['emp_id'], row['batch_id']) for row in rows]
+                    )
+                )
+            )
+            self._bulk_insert(Payslip, rows)
+            return
+        
+        stmt = dialect_insert(Payslip.__table__)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["emp_id", "batch_id"],
+            set_={
+                column: stmt.excluded[column]
+                for column in rows[0] if column not in ("emp_id", "batch_id")
+            }
+        )
+        self.db.execute(stmt, rows)
+    
     def approve_payroll(self, batch_id: int, approver_id: int) -> Dict[str, Any]:
         """
         Approve payroll batch and enable employee logins
         """
-        batch = self.db.query(PayrollBatch).filter(PayrollBatch.id == batch_id).first()
+        batch = self.db.get(PayrollBatch, batch_id)
         if not batch:
             raise ValueError("Batch not found")
         
@@ -221,86 +395,168 @@ class PayrollService:
         # Update batch status
         batch.status = PayrollStatus.APPROVED
         batch.approved_by = approver_id
-        batch.approved_at = datetime.utcnow()
-        
-        # Get all employees in this batch
-        employees = self.db.query(Employee).filter(Employee.batch_id == batch_id).all()
-        enabled_count = 0
-        
-        for emp in employees:
-            # Create or update user account for employee
-            user = self.db.query(User).filter(User.emp_id == emp.emp_id).first()
-            
-            if not user:
-                # Create new user account
-                # Default password is emp_id (should be changed on first login)
-                user = User(
-                    email=emp.email if emp.email and '@' in str(emp.email) else f"{emp.emp_id.lower()}@company.com",
-                    password_hash=get_password_hash(emp.emp_id),
-                    name=emp.name,
-                    role=UserRole.EMPLOYEE,
-                    emp_id=emp.emp_id,
-                    can_login=True
-                )
-                self.db.add(user)
-            else:
-                # Enable login for existing user
-                user.can_login = True
-            
-            # Link payslip to user
-            payslip = self.db.query(Payslip).filter(
-                Payslip.emp_id == emp.emp_id,
-                Payslip.batch_id == batch_id
-            ).first()
-            if payslip:
-                payslip.user_id = user.id
-            
-            enabled_count += 1
+        # Kept locally: reading it back after the commit would reload the batch
+        approved_at = datetime.utcnow()
+        batch.approved_at = approved_at
+        
+        # Enable login for every existing account in this batch in one UPDATE
+        batch_emp_ids = select(Employee.emp_id).where(Employee.batch_id == batch_id)
+        self.db.execute(
+            update(User).where(User.emp_id.in_(batch_emp_ids)).values(can_login=True)
+        )
+        
+        # Every employee in the batch with their existing account id, if any
+        employees = self.db.execute(
+            select(Employee.emp_id, Employee.name, Employee.email, User.id.label("user_id"))
+            .outerjoin(User, User.emp_id == Employee.emp_id)
+            .where(Employee.batch_id == batch_id)
+        ).all()
+        enabled_count = len(employees)
+        
+        # Create user accounts for employees that don't have one yet
+        # Default password is emp_id (should be changed on first login)
+        new_emps = [emp for emp in employees if emp.user_id is None]
+        password_hashes = _hash_passwords([emp.emp_id for emp in new_emps])
+        # Excel emails without an "@" (blank, "nan") fall back to a company address
+        emails = pd.Series([emp.email for emp in new_emps], dtype=object)
+        fallback_emails = pd.Series([f"{emp.emp_id.lower()}@company.com" for emp in new_emps], dtype=object)
+        login_emails = emails.where(emails.str.contains('@', regex=False, na=False), fallback_emails)
+        new_users = [
+            {
+                "email": email,
+                "password_hash": password_hash,
+                "name": emp.name,
+                "role": UserRole.EMPLOYEE,
+                "emp_id": emp.emp_id,
+                "can_login": True
+            }
+            for emp, email, password_hash in zip(new_emps, login_emails.tolist(), password_hashes)
+        ]
+        self._bulk_insert(User, new_users)
+        
+        # Link payslips to users with one correlated UPDATE
+        self.db.execute(
+            update(Payslip.__table__)
+            .where(Payslip.batch_id == batch_id, Payslip.emp_id.in_(batch_emp_ids))
+            .values(user_id=select(User.id).where(User.emp_id == Payslip.emp_id).scalar_subquery())
+        )
         
         self.db.commit()
+        # can_login changed for this batch's users
+        invalidate_cached_user()
         
         return {
             "batch_id": batch_id,
             "employees_enabled": enabled_count,
-            "approved_at": batch.approved_at.isoformat()
+            "approved_at": approved_at.isoformat()
         }
     
     def get_employees(self, batch_id: Optional[int] = None) -> List[Employee]:
         """Get all employees, optionally filtered by batch"""
-        query = self.db.query(Employee)
+        query = self.db.query(Employee).options(_EMPLOYEE_API_COLUMNS)
         if batch_id:
             query = query.filter(Employee.batch_id == batch_id)
         return query.all()
     
     def get_payslips(self, batch_id: Optional[int] = None, emp_id: Optional[str] = None) -> List[Payslip]:
         """Get payslips with optional filters"""
-        query = self.db.query(Payslip)
+        query = self.db.query(Payslip).options(_PAYSLIP_API_COLUMNS)
         if batch_id:
             query = query.filter(Payslip.batch_id == batch_id)
         if emp_id:
             query = query.filter(Payslip.emp_id == emp_id)
         return query.all()
     
+    def get_payslips_with_status(self, batch_id: Optional[int] = None) -> Tuple[List[Payslip], str]:
+        """
+        Get a batch's payslips (default: the current batch) and its status
+        
+        The current batch id comes from the lookup cache, and the batch is
+        read together with its payslips in one outer-joined query.
+        """
+        if not batch_id:
+            batch_id = self.get_current_batch_id()
+            if batch_id is None:
+                return self.get_payslips(), "unknown"
+        
+        rows = self.db.execute(
+            select(PayrollBatch.status, Payslip)
+            .options(_PAYSLIP_API_COLUMNS)
+            .outerjoin(Payslip, Payslip.batch_id == PayrollBatch.id)
+            .where(PayrollBatch.id == batch_id)
+            .order_by(Payslip.id)
+        ).all()
+        if not rows:
+            return [], "unknown"
+        return [payslip for _, payslip in rows if payslip is not None], rows[0][0].value
+    
+    def iter_employees(self, batch_id: Optional[int] = None, chunk_size: int = 1000) -> Iterator[Row]:
+        """Yield employee rows in id order, fetching chunk_size rows at a time"""
+        employees = Employee.__table__
+        query = select(employees).order_by(employees.c.id)
+        if batch_id:
+            query = query.where(employees.c.batch_id == batch_id)
+        yield from self.db.execute(query.execution_options(yield_per=chunk_size))
+    
+    def iter_payslips(self, batch_id: Optional[int] = None, chunk_size: int = 1000) -> Iterator[Row]:
+        """Yield payslip rows in id order, fetching chunk_size rows at a time"""
+        payslips = Payslip.__table__
+        query = select(payslips).order_by(payslips.c.id)
+        if batch_id:
+            query = query.where(payslips.c.batch_id == batch_id)
+        yield from self.db.execute(query.execution_options(yield_per=chunk_size))
+    
     def get_payslip_by_id(self, payslip_id: int) -> Optional[Payslip]:
         """Get a specific payslip"""
-        return self.db.query(Payslip).filter(Payslip.id == payslip_id).first()
+        return self.db.get(Payslip, payslip_id)
+    
+    def get_employee_payslip(self, emp_id: str) -> Optional[Row]:
+        """
+        Get the latest approved payslip for an employee
+        
+        Returns a Core row (attribute and ``_mapping`` access) rather than an
+        ORM instance, since callers only read scalar columns.
+        """
+        payslips = Payslip.__table__
+        batches = PayrollBatch.__table__
+        return self.db.execute(
+            select(payslips)
+            .join(batches, payslips.c.batch_id == batches.c.id)
+            .where(
+                payslips.c.emp_id == emp_id,
+                batches.c.status == PayrollStatus.APPROVED
+            )
+            .order_by(payslips.c.created_at.desc(), payslips.c.id.desc())
+            .limit(1)
+        ).first()
     
-    def get_employee_payslip(self, emp_id: str) -> Optional[Payslip]:
-        """Get the latest approved payslip for an employee"""
-        return self.db.query(Payslip).join(PayrollBatch).filter(
-            Payslip.emp_id == emp_id,
-            PayrollBatch.status == PayrollStatus.APPROVED
-        ).order_by(Payslip.created_at.desc()).first()
+    def get_current_batch_id(self) -> Optional[int]:
+        """Id of the most recent payroll batch (cached until the next upload)"""
+        # created_at has second resolution (server default); id breaks ties
+        return self._cached_lookup(
+            "current_batch_id",
+            lambda: self.db.execute(
+                select(PayrollBatch.id)
+                .order_by(PayrollBatch.created_at.desc(), PayrollBatch.id.desc())
+                .limit(1)
+            ).scalar()
+        )
     
     def get_current_batch(self) -> Optional[PayrollBatch]:
-        """Get the most recent payroll batch"""
-        return self.db.query(PayrollBatch).order_by(
-            PayrollBatch.created_at.desc()
-        ).first()
+        """
+        Get the most recent payroll batch
+        
+        Only the id is cached; the row is read by primary key (identity map
+        first), so status changes made by any worker show up immediately.
+        """
+        batch_id = self.get_current_batch_id()
+        if batch_id is None:
+            return None
+        return self.db.get(PayrollBatch, batch_id)
     
     def get_batch_by_id(self, batch_id: int) -> Optional[PayrollBatch]:
         """Get a specific batch"""
-        return self.db.query(PayrollBatch).filter(PayrollBatch.id == batch_id).first()
+        return self.db.get(PayrollBatch, batch_id)
     
     def regenerate_single_payslip(self, emp_id: str, batch_id: int) -> Dict[str, Any]:
         """
@@ -316,19 +572,17 @@ class PayrollService:
             self._apply_policy_to_agent(policy)
         
         # >>> PAYROLL.PY CALL - Reload Excel and generate single payslip <<<
-        self.agent.load_uploaded_excel(batch.excel_file_path)
+        # Served from the parsed-workbook memo unless the file has changed
+        self.agent.ensure_loaded(batch.excel_file_path)
         result = self.agent.generate_single_payslip(emp_id)
         
-        # Update database
-        payslip = self.db.query(Payslip).filter(
-            Payslip.emp_id == emp_id,
-            Payslip.batch_id == batch_id
-        ).first()
-        
-        if payslip:
-            payslip.net_pay = result['net_pay']
-            payslip.pdf_path = result.get('pdf_path')
-            # Update other fields...
-            self.db.commit()
+        # Update database: every recalculated column in one UPDATE, without
+        # loading the payslip (no-op when the employee has no payslip yet)
+        self.db.execute(
+            update(Payslip.__table__)
+            .where(Payslip.emp_id == emp_id, Payslip.batch_id == batch_id)
+            .values(**_payslip_values(result))
+        )
+        self.db.commit()
         
         return result
@@ -0,0 +1,114 @@
+"""
+SmallIntEnum columns against databases created by the old VARCHAR schema
+"""
+import pytest
+from sqlalchemy import create_engine, inspect, Integer
+from sqlalchemy.orm import Session
+
+from models import PayrollBatch, PayrollStatus, User, UserRole
+from models.database import migrate_enum_columns
+
+# Column types as created by the schema before SmallIntEnum
+LEGACY_DDL = [
+    """
+    CREATE TABLE users (
+        id INTEGER NOT NULL,
+        email VARCHAR(255) NOT NULL,
+        password_hash VARCHAR(255) NOT NULL,
+        name VARCHAR(255) NOT NULL,
+        role VARCHAR(8) NOT NULL,
+        emp_id VARCHAR(50),
+        can_login BOOLEAN,
+        is_active BOOLEAN,
+        created_at DATETIME,
+        updated_at DATETIME,
+        PRIMARY KEY (id),
+        UNIQUE (emp_id)
+    )
+    """,
+    "CREATE UNIQUE INDEX ix_users_email ON users (email)",
+    """
+    CREATE TABLE payroll_batches (
+        id INTEGER NOT NULL,
+        month VARCHAR(50) NOT NULL,
+        excel_file_path VARCHAR(500),
+        status VARCHAR(9),
+        total_employees INTEGER,
+        total_amount FLOAT,
+        approved_by INTEGER,
+        approved_at DATETIME,
+        created_at DATETIME,
+        updated_at DATETIME,
+        PRIMARY KEY (id),
+        FOREIGN KEY(approved_by) REFERENCES users (id)
+    )
+    """,
+]
+
+# Member names from the old schema, plus codes that TEXT affinity stored as
+# strings when new code wrote to a column that was still VARCHAR
+LEGACY_ROWS = [
+    "INSERT INTO users (id, email, password_hash, name, role, emp_id, can_login, is_active) "
+    "VALUES (1, 'hr@x.com', 'h', 'HR', 'HR', NULL, 1, 1)",
+    "INSERT INTO users (id, email, password_hash, name, role, emp_id, can_login, is_active) "
+    "VALUES (2, 'e1@x.com', 'h', 'E1', 'EMPLOYEE', 'E1', 1, 1)",
+    "INSERT INTO users (id, email, password_hash, name, role, emp_id, can_login, is_active) "
+    "VALUES (3, 'e2@x.com', 'h', 'E2', 2, 'E2', 1, 1)",
+    "INSERT INTO payroll_batches (id, month, status, total_employees, total_amount, approved_by) "
+    "VALUES (1, 'January 2026', 'APPROVED', 2, 10.0, 1)",
+    "INSERT INTO payroll_batches (id, month, status, total_employees, total_amount) "
+    "VALUES (2, 'February 2026', 1, 2, 0.0)",
+]
+
+
+@pytest.fixture
+def legacy_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as conn:
+        for statement in LEGACY_DDL + LEGACY_ROWS:
+            conn.exec_driver_sql(statement)
+    yield engine
+    engine.dispose()
+
+
+def test_unmigrated_rows_decode(legacy_engine):
+    with Session(legacy_engine) as db:
+        roles = {user.id: user.role for user in db.query(User).order_by(User.id)}
+        statuses = {batch.id: batch.status for batch in db.query(PayrollBatch)}
+    
+    assert roles == {1: UserRole.HR, 2: UserRole.EMPLOYEE, 3: UserRole.EMPLOYEE}
+    assert statuses == {1: PayrollStatus.APPROVED, 2: PayrollStatus.DRAFT}
+
+
+def test_migration_converts_columns_and_rows(legacy_engine):
+    migrate_enum_columns(legacy_engine)
+    
+    columns = {
+        (table, col["name"]): col["type"]
+        for table in ("users", "payroll_batches")
+        for col in inspect(legacy_engine).get_columns(table)
+    }
+    assert isinstance(columns[("users", "role")], Integer)
+    assert isinstance(columns[("payroll_batches", "status")], Integer)
+    
+    with legacy_engine.connect() as conn:
+        assert conn.exec_driver_sql("SELECT id, role FROM users ORDER BY id").all() == [(1, 1), (2, 2), (3, 2)]
+        assert conn.exec_driver_sql("SELECT id, status FROM payroll_batches ORDER BY id").all() == [(1, 3), (2, 1)]
+    
+    # Filters bind the integer code and now match the legacy rows
+    with Session(legacy_engine) as db:
+        assert db.query(User).filter(User.role == UserRole.EMPLOYEE).count() == 2
+        approved = db.query(PayrollBatch).filter(PayrollBatch.status == PayrollStatus.APPROVED).one()
+        assert (approved.id, approved.approved_by, approved.month) == (1, 1, "January 2026")
+        
+        db.add(User(email="e3@x.com", password_hash="h", name="E3", role=UserRole.EMPLOYEE, emp_id="E3"))
+        db.commit()
+        assert db.query(User).filter(User.email == "e3@x.com").one().role == UserRole.EMPLOYEE
+
+
+def test_migration_is_idempotent(legacy_engine):
+    migrate_enum_columns(legacy_engine)
+    migrate_enum_columns(legacy_engine)
+    
+    with legacy_engine.connect() as conn:
+        assert conn.exec_driver_sql("SELECT count(*) FROM users").scalar() == 3